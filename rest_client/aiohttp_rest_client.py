@@ -1,51 +1,128 @@
+import asyncio
+
 import aiohttp
-import json
+from multidict import CIMultiDict
+from pydantic_core import from_json, to_json
 
 from .base_rest_client import RestClient
 
 
+def _decode(raw: bytes, status: int):
+    if not raw:
+        return None
+    try:
+        return from_json(raw)
+    except ValueError:
+        if 200 <= status < 300:
+            raise
+        # A non-JSON error body, e.g. an HTML error page from a proxy, is returned as text
+        return raw.decode(errors='replace')
+
+
 class AioHttpRestClient(RestClient):
 
-    def __init__(self, base_url: str, headers: dict | None = None, raise_for_status: bool = False):
+    def __init__(self, base_url: str, headers: dict | None = None, raise_for_status: bool = False,
+                 limit_per_host: int = 64, auto_decompress: bool = False,
+                 timeout: aiohttp.ClientTimeout | None = None, connector_kwargs: dict | None = None):
         super().__init__(base_url, headers, raise_for_status)
+        self.limit_per_host = limit_per_host
+        self.auto_decompress = auto_decompress
+        self.timeout = timeout if timeout is not None else aiohttp.ClientTimeout(total=30, connect=5)
+        self.connector_kwargs = dict(connector_kwargs) if connector_kwargs else {}
+        self._session: aiohttp.ClientSession | None = None
+        self._session_loop: asyncio.AbstractEventLoop | None = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        # The session is created lazily so that it binds to the running event loop, and is rebuilt
+        # when the client is used from another loop (e.g. across separate asyncio.run() calls)
+        loop = asyncio.get_running_loop()
+        if self._session is not None and self._session_loop is not loop:
+            old_session, old_loop = self._session, self._session_loop
+            if not old_loop.is_closed() and not old_loop.is_running():
+                raise RuntimeError(
+                    'The client session is bound to another event loop that is still open; '
+                    'call close() on that loop before using the client from a different one'
+                )
+            self._session = None
+            self._session_loop = None
+            if old_loop.is_closed():
+                # Its loop is gone, so this only marks the stale session and connector as closed
+                await old_session.close()
+            else:
+                # The session's connections belong to its loop, so it is closed there
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(old_session.close(), old_loop))
+        if self._session is None or self._session.closed:
+            # connector_kwargs override the connector defaults
+            connector = aiohttp.TCPConnector(**{
+                'limit': 0,
+                'limit_per_host': self.limit_per_host,
+                'ttl_dns_cache': 300,
+                'enable_cleanup_closed': True,
+                'keepalive_timeout': 75,
+                **self.connector_kwargs,
+            })
+            headers = CIMultiDict(self.headers)
+            if not self.auto_decompress:
+                # Responses are not decompressed, so ask the server not to compress them
+                headers.setdefault('Accept-Encoding', 'identity')
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                trust_env=True,
+                raise_for_status=self.raise_for_status,
+                headers=headers,
+                read_bufsize=2 ** 17,
+                auto_decompress=self.auto_decompress,
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._session_loop = None
+
+    async def _request(self, method: str, url: str, data: dict | None | list | bytes = None):
+        session = await self._get_session()
+        # Pre-encoded bytes are sent as they are, anything else is encoded as JSON
+        body = data if data is None or isinstance(data, bytes) else to_json(data)
+        response = await session.request(method, self.base_url + url, data=body)
+        try:
+            if response.status == 204 or response.content_length == 0:
+                return None, response.status
+            encoding = response.headers.get('Content-Encoding', '').lower()
+            if not self.auto_decompress and encoding not in ('', 'identity'):
+                # The server ignored 'Accept-Encoding: identity', and the body would be decoded as garbage
+                raise aiohttp.ClientResponseError(
+                    response.request_info,
+                    response.history,
+                    status=response.status,
+                    message=f'Received a {encoding}-encoded response with auto_decompress disabled',
+                    headers=response.headers,
+                )
+            raw = await response.read()
+            return _decode(raw, response.status), response.status
+        finally:
+            response.release()
 
     async def get(self, url: str):
-        async with aiohttp.ClientSession(trust_env=True, raise_for_status=self.raise_for_status) as session:
-            async with session.get(url=self.base_url + url, headers=self.headers) as response:
-                json_data = await response.json()
-                status = response.status
-                return json_data, status
+        return await self._request('GET', url)
 
     async def delete(self, url: str):
-        async with aiohttp.ClientSession(trust_env=True, raise_for_status=self.raise_for_status) as session:
-            async with session.delete(url=self.base_url + url, headers=self.headers) as response:
-                status = response.status
-                if status == 200:
-                    json_data = await response.json()
-                else:
-                    json_data = None
-                return json_data, status
-
-    async def post(self, url: str, data: dict | None | list = None):
-        async with aiohttp.ClientSession(trust_env=True, raise_for_status=self.raise_for_status) as session:
-            data = json.dumps(data) if data else None
-            async with session.post(url=self.base_url + url, data=data, headers=self.headers) as response:
-                json_data = await response.json()
-                status = response.status
-                return json_data, status
-
-    async def put(self, url: str, data: dict | None | list = None):
-        async with aiohttp.ClientSession(trust_env=True, raise_for_status=self.raise_for_status) as session:
-            data = json.dumps(data) if data else None
-            async with session.put(url=self.base_url + url, data=data, headers=self.headers) as response:
-                json_data = await response.json()
-                status = response.status
-                return json_data, status
-
-    async def patch(self, url: str, data: dict | None | list = None):
-        async with aiohttp.ClientSession(trust_env=True, raise_for_status=self.raise_for_status) as session:
-            data = json.dumps(data) if data is not None else None
-            async with session.patch(url=self.base_url + url, data=data, headers=self.headers) as response:
-                json_data = await response.json()
-                status = response.status
-                return json_data, status
+        return await self._request('DELETE', url)
+
+    async def post(self, url: str, data: dict | None | list | bytes = None):
+        return await self._request('POST', url, data)
+
+    async def put(self, url: str, data: dict | None | list | bytes = None):
+        return await self._request('PUT', url, data)
+
+    async def patch(self, url: str, data: dict | None | list | bytes = None):
+        return await self._request('PATCH', url, data)
@@ -1,6 +1,6 @@
 from typing import Type
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 
 class RestClient:
@@ -9,24 +9,34 @@ class RestClient:
     def __init__(self, base_url: str, headers: dict | None = None, raise_for_status: bool = False):
         self.base_url = base_url
         self.raise_for_status = raise_for_status
-        if headers:
-            self.headers = headers
+        # Copied per instance, so changing one client's headers never leaks into the class default
+        self.headers = dict(headers if headers else type(self).headers)
 
     @staticmethod
     def get_response_model(base_model: Type[BaseModel] | None = None):
+        # The base_model checks are resolved here, once, so each wrapper only handles the response
         def decorator(func):
-            async def wrapper(*args, **kwargs):
-                json_data, status = await func(*args, **kwargs)
-                is_received = status in (200, 201)
-
-                if base_model is None:
+            if base_model is None:
+                async def wrapper(*args, **kwargs):
+                    _, status = await func(*args, **kwargs)
                     return None, status
-                elif issubclass(base_model, BaseModel) and is_received:
-                    return base_model(**json_data), status
-                elif isinstance(json_data, list) and is_received:
-                    return [base_model(**i) for i in json_data]
-                else:
-                    return json_data, status
+
+            elif not issubclass(base_model, BaseModel):
+                async def wrapper(*args, **kwargs):
+                    return await func(*args, **kwargs)
+
+            else:
+                # Building a TypeAdapter compiles a validator, so it is done once per decorated method
+                list_adapter = TypeAdapter(list[base_model])
+
+                async def wrapper(*args, **kwargs):
+                    json_data, status = await func(*args, **kwargs)
+                    if status not in (200, 201) or json_data is None:
+                        return json_data, status
+                    elif isinstance(json_data, list):
+                        return list_adapter.validate_python(json_data), status
+                    else:
+                        return base_model.model_validate(json_data), status
 
             return wrapper
 
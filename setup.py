@@ -4,9 +4,11 @@ setup(
     name='pydantic_rest_client',
     version='1.0',
     packages=find_packages(exclude=['tests']),
+    python_requires='>=3.10',
     install_requires=[
-        'aiohttp',
-        'pydantic',
+        'aiohttp>=3.9',
+        'multidict>=4.5',
+        'pydantic>=2.5',
     ],
     author='Damian Sop',
     author_email='damian.sop.official@gmail.com',
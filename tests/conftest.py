@@ -0,0 +1,23 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from rest_client import AioHttpRestClient
+from .example import ApiExample
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_asyncio_loop_factories(config, item):
+    # uvloop schedules sockets and callbacks faster when available, the default loop is used otherwise
+    try:
+        import uvloop
+    except ImportError:
+        return {'asyncio': asyncio.new_event_loop}
+    return {'uvloop': uvloop.new_event_loop}
+
+
+@pytest_asyncio.fixture(scope='session', loop_scope='session')
+async def api():
+    async with AioHttpRestClient('https://reqres.in/api') as client:
+        yield ApiExample(client=client)
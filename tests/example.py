@@ -25,17 +25,19 @@ class PutUserModel(BaseModel):
     updatedAt: str
 
 
-# Create an API client using AioHttpRestClient
+# Wrap an injected AioHttpRestClient, so a single client (and session) can be shared
 class ApiExample:
-    client = AioHttpRestClient('https://reqres.in/api')
+
+    def __init__(self, client: AioHttpRestClient):
+        self.client = client
 
     # Define a method to get user data
-    @client.get_response_model(DataModel)
+    @AioHttpRestClient.get_response_model(DataModel)
     def get_user(self, user_id: int):
         return self.client.get(f'/users/{user_id}')
 
     # Define a method to post user data
-    @client.get_response_model(PostUserModel)
+    @AioHttpRestClient.get_response_model(PostUserModel)
     def post_user(self, name: str, job: str):
         user_dict = {
             'name': name,
@@ -43,17 +45,17 @@ class ApiExample:
         }
         return self.client.post(f'/users', user_dict)
 
-    @client.get_response_model(DataModel)
+    @AioHttpRestClient.get_response_model(DataModel)
     def get_not_found_user(self, user_id: int):
         return self.client.get(f'/unknown/{user_id}')
 
     # Define a method to delete user data
-    @client.get_response_model()
+    @AioHttpRestClient.get_response_model()
     def delete_user(self, user_id: int = 2):
         return self.client.delete(f'/users/{user_id}')
 
     # Define a method to put user data
-    @client.get_response_model(PutUserModel)
+    @AioHttpRestClient.get_response_model(PutUserModel)
     def put_user(self, user_id: int = 2, name: str = 'Damian', job: str = 'developer'):
         user_dict = {
             'name': name,
@@ -62,7 +64,7 @@ class ApiExample:
         return self.client.put(f'/users/{user_id}', user_dict)
 
     # Define a method to patch user data
-    @client.get_response_model(PutUserModel)
+    @AioHttpRestClient.get_response_model(PutUserModel)
     def patch_user(self, user_id: int = 2, name: str = 'Damian', job: str = 'developer'):
         user_dict = {
             'name': name,
@@ -0,0 +1,385 @@
+import asyncio
+import gzip
+import threading
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from pydantic import BaseModel
+
+from rest_client import AioHttpRestClient
+
+
+async def get_object(request):
+    return web.json_response({'id': int(request.match_info['id']), 'name': 'Damian'})
+
+
+async def get_wrapped_object(request):
+    return web.json_response({'data': {'id': int(request.match_info['id']), 'name': 'Damian'}})
+
+
+async def get_objects(request):
+    return web.json_response([{'id': 1, 'name': 'Damian'}, {'id': 2, 'name': 'Jane'}])
+
+
+async def get_padded_objects(request):
+    return web.Response(text=' \n [{"id": 3, "name": "Padded"}]', content_type='application/json')
+
+
+async def get_json_error(request):
+    return web.json_response({'detail': 'Not found'}, status=404)
+
+
+async def get_html_error(request):
+    return web.Response(text='<html>Bad gateway</html>', status=502, content_type='text/html')
+
+
+async def get_text_body(request):
+    return web.Response(text='not json', content_type='text/plain')
+
+
+async def get_gzipped_object(request):
+    # Compressed regardless of the request's Accept-Encoding, as some servers do
+    return web.Response(
+        body=gzip.compress(b'{"id": 5, "name": "Zipped"}'),
+        headers={'Content-Encoding': 'gzip', 'Content-Type': 'application/json'},
+    )
+
+
+async def get_no_content(request):
+    return web.Response(status=204)
+
+
+async def get_empty_body(request):
+    return web.Response(status=200, headers={'Content-Length': '0'})
+
+
+async def get_chunked_empty_body(request):
+    # Chunked responses carry no Content-Length, so the client can only tell they are empty by reading them
+    response = web.StreamResponse()
+    response.enable_chunked_encoding()
+    await response.prepare(request)
+    await response.write_eof()
+    return response
+
+
+async def delete_object(request):
+    if request.match_info['id'] == '1':
+        return web.Response(status=204)
+    return web.json_response({'detail': 'Not found'}, status=404)
+
+
+async def echo(request):
+    return web.json_response({
+        'content_type': request.headers.get('Content-Type'),
+        'body': (await request.read()).decode(),
+    })
+
+
+async def get_slow(request):
+    await asyncio.sleep(0.5)
+    return web.json_response({})
+
+
+async def get_headers(request):
+    return web.json_response(dict(request.headers))
+
+
+def make_app() -> web.Application:
+    app = web.Application()
+    app.router.add_get('/objects', get_objects)
+    app.router.add_get('/objects/{id}', get_object)
+    app.router.add_get('/wrapped-objects/{id}', get_wrapped_object)
+    app.router.add_get('/padded-objects', get_padded_objects)
+    app.router.add_get('/json-error', get_json_error)
+    app.router.add_get('/html-error', get_html_error)
+    app.router.add_get('/text-body', get_text_body)
+    app.router.add_get('/gzipped-object', get_gzipped_object)
+    app.router.add_get('/no-content', get_no_content)
+    app.router.add_get('/empty-body', get_empty_body)
+    app.router.add_get('/chunked-empty-body', get_chunked_empty_body)
+    app.router.add_delete('/objects/{id}', delete_object)
+    app.router.add_get('/slow', get_slow)
+    app.router.add_get('/headers', get_headers)
+    for method in ('POST', 'PUT', 'PATCH'):
+        app.router.add_route(method, '/echo', echo)
+    return app
+
+
+@pytest.fixture(scope='module')
+def base_url():
+    # The server runs on its own loop in a thread, so it outlives the loops the tests create
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(make_app())
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    loop.run_until_complete(site.start())
+    port = runner.addresses[0][1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    yield f'http://127.0.0.1:{port}'
+
+    asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def test_client_survives_separate_event_loops(base_url):
+    client = AioHttpRestClient(base_url)
+
+    _, first_status = asyncio.run(client.get('/objects/1'))
+    _, second_status = asyncio.run(client.get('/objects/2'))
+
+    assert first_status == 200
+    assert second_status == 200
+    asyncio.run(client.close())
+
+
+def test_session_on_a_running_loop_is_closed_there_before_rebinding(base_url):
+    client = AioHttpRestClient(base_url)
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        _, first_status = asyncio.run_coroutine_threadsafe(client.get('/objects/1'), other_loop).result()
+        old_session = client._session
+
+        async def get_and_close():
+            response = await client.get('/objects/2')
+            assert client._session is not old_session
+            await client.close()
+            return response
+
+        _, second_status = asyncio.run(get_and_close())
+
+        assert (first_status, second_status) == (200, 200)
+        assert old_session.closed
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join()
+        other_loop.close()
+
+
+def test_session_on_an_idle_open_loop_is_not_silently_rebound(base_url):
+    client = AioHttpRestClient(base_url)
+    other_loop = asyncio.new_event_loop()
+    try:
+        other_loop.run_until_complete(client.get('/objects/1'))
+
+        with pytest.raises(RuntimeError, match='another event loop'):
+            asyncio.run(client.get('/objects/2'))
+    finally:
+        other_loop.run_until_complete(client.close())
+        other_loop.close()
+
+
+class ObjectModel(BaseModel):
+    id: int
+    name: str
+
+
+class ObjectApi:
+
+    def __init__(self, client: AioHttpRestClient):
+        self.client = client
+
+    @AioHttpRestClient.get_response_model(ObjectModel)
+    def get_object(self, object_id: int):
+        return self.client.get(f'/objects/{object_id}')
+
+    @AioHttpRestClient.get_response_model(ObjectModel)
+    def get(self, url: str):
+        return self.client.get(url)
+
+    @AioHttpRestClient.get_response_model(dict)
+    def get_untyped(self, url: str):
+        return self.client.get(url)
+
+    @AioHttpRestClient.get_response_model(ObjectModel)
+    def get_inner_object(self, object_id: int):
+        return self._fetch_inner_object(object_id)
+
+    async def _fetch_inner_object(self, object_id: int):
+        data, status = await self.client.get(f'/wrapped-objects/{object_id}')
+        return data['data'], status
+
+    @AioHttpRestClient.get_response_model(ObjectModel)
+    async def get_renamed_object(self, object_id: int):
+        data, status = await self.client.get(f'/objects/{object_id}')
+        return {**data, 'name': 'Renamed'}, status
+
+
+@pytest_asyncio.fixture
+async def client(base_url):
+    async with AioHttpRestClient(base_url) as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_client_methods_return_decoded_json(client):
+    data, status = await client.get('/objects/1')
+    assert status == 200
+    assert data == {'id': 1, 'name': 'Damian'}
+
+
+@pytest.mark.asyncio
+async def test_decorated_method_validates_response(client):
+    data, status = await ObjectApi(client).get_object(1)
+    assert status == 200
+    assert data == ObjectModel(id=1, name='Damian')
+
+
+@pytest.mark.asyncio
+async def test_decorated_sync_method_returning_async_helper(client):
+    data, status = await ObjectApi(client).get_inner_object(4)
+    assert status == 200
+    assert data == ObjectModel(id=4, name='Damian')
+
+
+@pytest.mark.asyncio
+async def test_decorated_method_validates_already_decoded_data(client):
+    data, status = await ObjectApi(client).get_renamed_object(1)
+    assert status == 200
+    assert data == ObjectModel(id=1, name='Renamed')
+
+
+@pytest.mark.asyncio
+async def test_headers_are_copied_into_the_session_when_it_is_created(base_url):
+    async with AioHttpRestClient(base_url) as client:
+        client.headers['Authorization'] = 'Bearer first'
+        data, _ = await client.get('/headers')
+        assert data['Authorization'] == 'Bearer first'
+
+        client.headers['Authorization'] = 'Bearer second'
+        data, _ = await client.get('/headers')
+        assert data['Authorization'] == 'Bearer first'
+
+        await client.close()
+        data, _ = await client.get('/headers')
+        assert data['Authorization'] == 'Bearer second'
+
+
+def test_subclass_headers_are_copied_per_instance():
+    class TokenClient(AioHttpRestClient):
+        headers = {'Content-Type': 'application/json', 'Authorization': 'Bearer token'}
+
+    first, second = TokenClient('http://localhost'), TokenClient('http://localhost')
+    first.headers['Authorization'] = 'Bearer other'
+
+    assert second.headers['Authorization'] == 'Bearer token'
+    assert TokenClient.headers['Authorization'] == 'Bearer token'
+    assert AioHttpRestClient('http://localhost').headers == {'Content-Type': 'application/json'}
+
+
+@pytest.mark.asyncio
+async def test_decorated_method_validates_json_array(client):
+    data, status = await ObjectApi(client).get('/objects')
+    assert status == 200
+    assert data == [ObjectModel(id=1, name='Damian'), ObjectModel(id=2, name='Jane')]
+
+
+@pytest.mark.asyncio
+async def test_decorated_method_validates_whitespace_prefixed_json_array(client):
+    data, status = await ObjectApi(client).get('/padded-objects')
+    assert status == 200
+    assert data == [ObjectModel(id=3, name='Padded')]
+
+
+@pytest.mark.asyncio
+async def test_decorated_method_returns_json_error_payload(client):
+    data, status = await ObjectApi(client).get('/json-error')
+    assert status == 404
+    assert data == {'detail': 'Not found'}
+
+
+@pytest.mark.asyncio
+async def test_decorated_method_returns_non_json_error_body_as_text(client):
+    data, status = await ObjectApi(client).get('/html-error')
+    assert status == 502
+    assert data == '<html>Bad gateway</html>'
+
+
+@pytest.mark.asyncio
+async def test_non_model_response_type_returns_decoded_json(client):
+    data, status = await ObjectApi(client).get_untyped('/objects/1')
+    assert status == 200
+    assert data == {'id': 1, 'name': 'Damian'}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('url, expected_status', [
+    ('/no-content', 204),
+    ('/empty-body', 200),
+    ('/chunked-empty-body', 200),
+])
+async def test_responses_without_body_return_none(client, url, expected_status):
+    assert await client.get(url) == (None, expected_status)
+    assert await ObjectApi(client).get(url) == (None, expected_status)
+
+
+@pytest.mark.asyncio
+async def test_delete_returns_error_body(client):
+    assert await client.delete('/objects/1') == (None, 204)
+    assert await client.delete('/objects/2') == ({'detail': 'Not found'}, 404)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('method', ['post', 'put', 'patch'])
+@pytest.mark.parametrize('data, expected_body', [
+    ({'name': 'Damian', 'job': 'developer'}, '{"name":"Damian","job":"developer"}'),
+    ([1, 2], '[1,2]'),
+    ({}, '{}'),
+    ([], '[]'),
+    (b'{"pre":"encoded"}', '{"pre":"encoded"}'),
+])
+async def test_request_bodies_are_sent_as_json(client, method, data, expected_body):
+    echoed, status = await getattr(client, method)('/echo', data)
+    assert status == 200
+    assert echoed == {'content_type': 'application/json', 'body': expected_body}
+
+
+@pytest.mark.asyncio
+async def test_request_without_data_sends_no_body(client):
+    echoed, _ = await client.post('/echo')
+    assert echoed['body'] == ''
+
+
+@pytest.mark.asyncio
+async def test_timeout_can_be_configured(base_url):
+    async with AioHttpRestClient(base_url, timeout=aiohttp.ClientTimeout(total=0.1)) as client:
+        with pytest.raises(asyncio.TimeoutError):
+            await client.get('/slow')
+
+
+@pytest.mark.asyncio
+async def test_connector_kwargs_override_connector_defaults(base_url):
+    async with AioHttpRestClient(base_url, limit_per_host=3, connector_kwargs={'limit': 5}) as client:
+        await client.get('/objects/1')
+        connector = client._session.connector
+        assert (connector.limit, connector.limit_per_host) == (5, 3)
+
+
+def test_unknown_constructor_arguments_are_rejected():
+    with pytest.raises(TypeError):
+        AioHttpRestClient('http://localhost', raise_for_staus=True)
+
+
+@pytest.mark.asyncio
+async def test_non_json_success_body_raises(client):
+    with pytest.raises(ValueError):
+        await client.get('/text-body')
+
+
+@pytest.mark.asyncio
+async def test_compressed_response_raises_when_decompression_is_off(client):
+    with pytest.raises(aiohttp.ClientResponseError, match='gzip-encoded'):
+        await client.get('/gzipped-object')
+
+
+@pytest.mark.asyncio
+async def test_compressed_response_is_decoded_when_decompression_is_on(base_url):
+    async with AioHttpRestClient(base_url, auto_decompress=True) as client:
+        assert await client.get('/gzipped-object') == ({'id': 5, 'name': 'Zipped'}, 200)
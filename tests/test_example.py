@@ -1,44 +1,38 @@
 import pytest
-from .example import ApiExample
 
-api_example = ApiExample()
+# Run every test on the session-wide event loop that the shared `api` client is bound to
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
 
-@pytest.mark.asyncio
-async def test_get_example():
-    example_data, status_code = await api_example.get_user(2)
+async def test_get_example(api):
+    example_data, status_code = await api.get_user(2)
     assert status_code == 200
     assert example_data.data.id == 2
 
 
-@pytest.mark.asyncio
-async def test_get_not_found_example():
-    example_data, status_code = await api_example.get_not_found_user(23)
+async def test_get_not_found_example(api):
+    example_data, status_code = await api.get_not_found_user(23)
     assert status_code == 404
 
 
-@pytest.mark.asyncio
-async def test_delete_example():
-    example_data, status_code = await api_example.delete_user()
+async def test_delete_example(api):
+    example_data, status_code = await api.delete_user()
     assert status_code == 204
 
 
-@pytest.mark.asyncio
-async def test_post_example():
-    example_data, status_code = await api_example.post_user(name='Damian', job='developer')
+async def test_post_example(api):
+    example_data, status_code = await api.post_user(name='Damian', job='developer')
     assert status_code == 201
     assert example_data.name == 'Damian'
 
 
-@pytest.mark.asyncio
-async def test_put_example():
-    example_data, status_code = await api_example.put_user()
+async def test_put_example(api):
+    example_data, status_code = await api.put_user()
     assert status_code == 200
     assert example_data.name == 'Damian'
 
 
-@pytest.mark.asyncio
-async def test_patch_example():
-    example_data, status_code = await api_example.patch_user()
+async def test_patch_example(api):
+    example_data, status_code = await api.patch_user()
     assert status_code == 200
     assert example_data.name == 'Damian'